@@ -1,6 +1,8 @@
-import re
 from typing import NamedTuple
 
+# Every ASCII byte outside [A-Za-z0-9], deleted from branch names via bytes.translate
+_NON_ALNUM_BYTES = bytes(b for b in range(128) if not chr(b).isalnum())
+
 
 class BuildInformation(NamedTuple):
     version: str
@@ -13,47 +15,34 @@ def _split_build_tag(version_identifier: str) -> BuildInformation:
     return BuildInformation(parts[0], parts[1] if len(parts) > 1 else "")
 
 
+def _release_part(current_ver: str) -> str:
+    # the release part of 1.2.3-build.4+branch.sha is 1.2.3
+    return current_ver.partition("-")[0]
+
+
+def _release_segments(current_ver: str, maxsplit: int) -> list[str]:
+    # callers that only need the leading segments pass maxsplit so the remainder
+    # is not split up.
+    return _release_part(current_ver).split(".", maxsplit)
+
+
 def bump_major(current_ver: str) -> str:
-    version, _ = _split_build_tag(current_ver)
-    version_segments = version.split(".")
-
-    bumped_ver = ".".join(
-        [
-            str(
-                int(version_segments[0]) + 1,
-            ),
-            "0",
-            "0",
-        ]
-    )
-    return bumped_ver
+    major = _release_segments(current_ver, 1)[0]
+
+    return f"{int(major) + 1}.0.0"
 
 
 def bump_minor(current_ver: str) -> str:
-    version, _ = _split_build_tag(current_ver)
-    version_segments = version.split(".")
-
-    bumped_ver = ".".join(
-        [
-            version_segments[0],
-            str(int(version_segments[1]) + 1),
-            "0",
-        ]
-    )
-    return bumped_ver
+    version_segments = _release_segments(current_ver, 2)
+
+    return f"{version_segments[0]}.{int(version_segments[1]) + 1}.0"
 
 
 def bump_patch(current_ver: str) -> str:
-    version, _ = _split_build_tag(current_ver)
-    version_segments = version.split(".")
+    # only the last segment is bumped, the segments before it are kept verbatim
+    prefix, dot, last_segment = _release_part(current_ver).rpartition(".")
 
-    bumped_ver = ".".join(
-        [
-            *version_segments[:-1],
-            str(int(version_segments[-1]) + 1),
-        ]
-    )
-    return bumped_ver
+    return f"{prefix}{dot}{int(last_segment) + 1}"
 
 
 def bump_build(
@@ -66,7 +55,10 @@ def bump_build(
         # 1.2.2-build.<X>+<branch_name>.<commit_sha1>
         version = bump_patch(version)
 
-    clean_branch = re.sub("[^A-Za-z0-9]+", "", branch_name)
+    # non-ASCII characters are dropped by the encode, the remaining symbols by translate
+    clean_branch = (
+        branch_name.encode("ascii", "ignore").translate(None, _NON_ALNUM_BYTES).decode()
+    )
 
     return "-".join(
         [version, "+".join([f"build.{build_number}", f"{clean_branch}.{commit_sha1}"])]
@@ -1,29 +1,66 @@
 import argparse
-import io
+import functools
+import hashlib
+import json
 import logging
+import operator
 import os
+import random
 import re
 import sys
+import tempfile
 import time
 import zipfile
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+from urllib.parse import quote
 
 import requests
+from urllib3.util.retry import Retry
 
 from .github_auth_redirect_adapter import GitHubAuthRedirectAdapter
 
 logger = logging.getLogger(__name__)
 
 # Constants
+HTTP_NOT_MODIFIED = 304
 HTTP_FORBIDDEN = 403
 HTTP_RATE_LIMITED = 429
 MAX_RETRIES = 5
 INITIAL_BACKOFF = 1.0  # seconds
 MAX_BACKOFF = 32.0  # seconds
 PER_PAGE = 100  # Maximum allowed by GitHub API
+MAX_PAGE_WORKERS = 4  # concurrent page requests, kept low to avoid secondary limits
+# Transient server errors are retried by the transport, rate limits are handled here.
+# Retry-After is ignored so rate limited responses are not retried by the transport
+# too, and timeouts are not retried so an unreachable API still fails fast.
+SERVER_ERROR_RETRY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+# Artifact zips up to this size are buffered in memory, larger ones spill to disk
+ZIP_SPOOL_SIZE = 8 * 1024 * 1024  # bytes
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes
 # Waiting for workflows
-WORKFLOW_POLL_INTERVAL = 10  # seconds between polls
+WORKFLOW_POLL_INTERVAL = 10  # seconds before the first poll, doubled while unchanged
+MAX_POLL_INTERVAL = 60  # seconds
+POLL_JITTER = 0.1  # fraction of the poll interval added at random
 MAX_WAIT_TIME = 1800  # 30 minutes maximum wait time
+# Run states that may still end in success, and conclusions that never will
+_IN_PROGRESS_STATUSES = frozenset(
+    {"in_progress", "action_required", "queued", "requested", "waiting", "pending"}
+)
+_FAILED_CONCLUSIONS = frozenset({"failure", "cancelled", "skipped"})
+
+# Matches one entry of a Link header: <https://api.github.com/...?page=2>; rel="next"
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
 
 api_url = os.getenv("GITHUB_API_URL", "https://api.github.com")
 repository = os.getenv("GITHUB_REPOSITORY")  # format: owner/repo
@@ -38,6 +75,27 @@ headers = (
     else {}
 )
 
+# A single session is shared by all GitHub calls, so the connection to the API is
+# kept alive across pages, polls and the artifact download. The adapter only sends
+# the auth headers to the API host and strips them when a redirect leaves it.
+# Every concurrent page request can keep its connection open for the next one.
+_SESSION = requests.Session()
+for _scheme in ("http://", "https://"):
+    _SESSION.mount(
+        _scheme,
+        GitHubAuthRedirectAdapter(
+            api_url,
+            headers,
+            pool_maxsize=MAX_PAGE_WORKERS,
+            max_retries=SERVER_ERROR_RETRY,
+        ),
+    )
+
+
+def get_session() -> requests.Session:
+    """Return the session shared by all GitHub calls, e.g. to mount other adapters."""
+    return _SESSION
+
 
 def _should_wait_for_success() -> bool:
     """
@@ -64,15 +122,48 @@ def _parse_link_header(link_header: str | None) -> dict[str, str]:
     if not link_header:
         return {}
 
-    links = {}
-    # Parse links like: <https://api.github.com/...?page=2>; rel="next"
-    for link in link_header.split(","):
-        match = re.match(r'<([^>]+)>;\s*rel="([^"]+)"', link.strip())
-        if match:
-            url, rel = match.groups()
-            links[rel] = url
+    return {rel: url for url, rel in _LINK_RE.findall(link_header)}
+
+
+# Most recent rate limit state reported by GitHub in the X-RateLimit-* headers
+_rate_limit: dict[str, int | None] = {"remaining": None, "reset": None}
+
+
+class RateLimitError(requests.exceptions.HTTPError):
+    """Raised when the GitHub API is still rate limited after all retries."""
+
+    def __init__(self, message: str, reset_at: int | None = None) -> None:
+        super().__init__(message)
+        # Unix timestamp at which the rate limit window resets, if known
+        self.reset_at = reset_at
+
+
+def _record_rate_limit(response: requests.Response) -> None:
+    """Remember the rate limit headers GitHub sends with every API response."""
+    try:
+        remaining = int(response.headers["X-RateLimit-Remaining"])
+        reset = int(response.headers["X-RateLimit-Reset"])
+    except (KeyError, TypeError, ValueError):
+        return
+
+    _rate_limit["remaining"] = remaining
+    _rate_limit["reset"] = reset
 
-    return links
+
+def _wait_for_rate_limit_reset() -> None:
+    """Sleep until the rate limit resets if the last response exhausted it.
+
+    This avoids spending a request on a guaranteed 429 response.
+    """
+    reset_time = _rate_limit["reset"]
+    if _rate_limit["remaining"] != 0 or reset_time is None:
+        return
+
+    wait_time = reset_time - int(time.time())
+    if wait_time > 0:
+        logger.info(f"Rate limit exhausted. Waiting {wait_time} seconds until reset.")
+        time.sleep(wait_time + 1)  # Add 1 second buffer
+    _rate_limit["remaining"] = None
 
 
 def _make_request_with_retry(
@@ -91,13 +182,16 @@ def _make_request_with_retry(
         The response object
 
     Raises:
-        requests.exceptions.HTTPError: If the request fails after all retries
+        requests.exceptions.HTTPError: If the request fails
+        RateLimitError: If the request is still rate limited after all retries
     """
     backoff = INITIAL_BACKOFF
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            _wait_for_rate_limit_reset()
+            response = _SESSION.get(url, headers=headers, timeout=30)
+            _record_rate_limit(response)
 
             if response.status_code == HTTP_RATE_LIMITED:
                 # Check if we have rate limit reset time
@@ -124,7 +218,7 @@ def _make_request_with_retry(
 
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
-            if e.response and e.response.status_code == HTTP_RATE_LIMITED:
+            if e.response is not None and e.response.status_code == HTTP_RATE_LIMITED:
                 if attempt == max_retries - 1:
                     logger.exception(
                         f"Max retries ({max_retries}) exceeded for rate limiting"
@@ -136,7 +230,138 @@ def _make_request_with_retry(
         else:
             return response
 
-    raise requests.exceptions.HTTPError(f"Failed after {max_retries} retries")
+    raise RateLimitError(
+        f"Failed after {max_retries} retries", reset_at=_rate_limit["reset"]
+    )
+
+
+def _cache_dir() -> Path | None:
+    """Return the directory for cached GitHub data, or None if caching is disabled.
+
+    Caching is only enabled on GitHub Actions runners, where entries are kept
+    under $RUNNER_TEMP for the remainder of the job.
+    """
+    runner_temp = os.getenv("RUNNER_TEMP")
+    return Path(runner_temp) / "github-semver" if runner_temp else None
+
+
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _write_cache_entry(cache_path: Path, content: str) -> None:
+    """Write a cache entry, logging instead of failing when that is not possible."""
+    # Write next to the entry and rename, so readers never see a partial entry
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(content)
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write cache entry {cache_path}: {e}")
+
+
+def _etag_cache_path(url: str) -> Path | None:
+    """Return the conditional request cache file for a URL."""
+    cache_dir = _cache_dir()
+    return cache_dir / "etags" / f"{_cache_key(url)}.json" if cache_dir else None
+
+
+def _version_cache_path(
+    commit_sha: str, artifact_name: str, workflow_name: str | None
+) -> Path | None:
+    """Return the cache file for the artifact content found for a commit."""
+    cache_dir = _cache_dir()
+    if not cache_dir:
+        return None
+
+    key = _cache_key(commit_sha, workflow_name or "", artifact_name)
+    return cache_dir / "versions" / key
+
+
+def _artifact_cache_path(run_id: str, artifact_name: str) -> Path | None:
+    """Return the cache file for the content of an artifact of a workflow run."""
+    cache_dir = _cache_dir()
+    if not cache_dir:
+        return None
+
+    # Artifacts cannot be changed once their run has uploaded them
+    return cache_dir / "artifacts" / _cache_key(str(run_id), artifact_name)
+
+
+# Responses that can be revalidated, by URL, for the lifetime of the process
+_response_cache: dict[str, dict[str, Any]] = {}
+
+
+def _read_cached_response(url: str) -> dict[str, Any] | None:
+    """Return the cached response for a URL from memory, or from disk."""
+    if cached := _response_cache.get(url):
+        return cached
+
+    cache_path = _etag_cache_path(url)
+    if not cache_path or not cache_path.is_file():
+        return None
+
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+    _response_cache[url] = cached
+    return cached
+
+
+def _get_json(url: str) -> tuple[Any, str | None]:
+    """GET a JSON document from the GitHub API, revalidating a cached copy.
+
+    Responses with an ETag or Last-Modified header are cached, and later requests
+    for the same URL send them as If-None-Match / If-Modified-Since. GitHub
+    answers those with 304 Not Modified when nothing changed, which has no body
+    and does not count against the rate limit. Entries are kept in memory, so
+    repeated polls of a run are revalidated, and on runners also on disk.
+
+    Args:
+        url: The URL to request
+
+    Returns:
+        The decoded JSON body and the Link header of the response
+    """
+    cached = _read_cached_response(url)
+    request_headers = headers
+    if cached:
+        request_headers = dict(headers)
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = _make_request_with_retry(url, request_headers)
+    if cached and response.status_code == HTTP_NOT_MODIFIED:
+        logger.debug("Not modified, using cached response for: %s", url)
+        return cached["body"], cached["link"]
+
+    data = response.json()
+    link_header = response.headers.get("Link")
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        cached = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "link": link_header,
+            "body": data,
+        }
+        _response_cache[url] = cached
+        if cache_path := _etag_cache_path(url):
+            _write_cache_entry(cache_path, json.dumps(cached))
+
+    return data, link_header
+
+
+def _with_jitter(delay: float) -> float:
+    """Spread concurrent pollers apart by adding up to POLL_JITTER of the delay."""
+    return delay + random.uniform(0, delay * POLL_JITTER)  # noqa: S311
 
 
 def _wait_for_workflow_completion(
@@ -156,12 +381,13 @@ def _wait_for_workflow_completion(
     run_id = workflow_run["id"]
     logger.info(f"Waiting for workflow run {run_id} to complete (max {max_wait_time}s)")
     start_time = time.time()
+    poll_interval = WORKFLOW_POLL_INTERVAL
+    last_status = workflow_run.get("status")
 
     while time.time() - start_time < max_wait_time:
         # Check the current status of this specific workflow run
         url = f"{api_url}/repos/{repository}/actions/runs/{run_id}"
-        response = _make_request_with_retry(url, headers)
-        current_run = response.json()
+        current_run, _ = _get_json(url)
 
         status = current_run.get("status")
         conclusion = current_run.get("conclusion")
@@ -175,10 +401,18 @@ def _wait_for_workflow_completion(
             )
             return None  # Workflow failed
 
+        # Poll tightly again as soon as the run moves, e.g. queued -> in_progress
+        if status != last_status:
+            poll_interval = WORKFLOW_POLL_INTERVAL
+            last_status = status
+
+        remaining = max_wait_time - (time.time() - start_time)
+        wait_time = min(_with_jitter(poll_interval), max(remaining, 0))
         logger.info(
-            f"Workflow run {run_id} still in progress, waiting {WORKFLOW_POLL_INTERVAL}s..."
+            f"Workflow run {run_id} still {status}, waiting {wait_time:.0f}s..."
         )
-        time.sleep(WORKFLOW_POLL_INTERVAL)
+        time.sleep(wait_time)
+        poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
 
     logger.info(f"Timeout waiting for workflow run {run_id}")
     return None
@@ -191,8 +425,9 @@ def get_last_successful_workflow_for_commit(
     """
     Use GitHub API to retrieve the last successful workflow run for a specific commit.
 
-    This function supports pagination to retrieve all workflow runs, not just the
-    first page. It also includes retry logic with exponential backoff for rate limiting.
+    This function walks the paginated workflow runs until a page contains a candidate
+    run; GitHub lists runs newest first, so older pages cannot hold a more recent one.
+    It also includes retry logic with exponential backoff for rate limiting.
 
     Always fetches both successful and in-progress workflows. If DO_NOT_WAIT_FOR_SUCCESS
     is set, immediately returns in-progress workflow. Otherwise, waits for them to complete.
@@ -219,20 +454,17 @@ def get_last_successful_workflow_for_commit(
         logger.info("Will wait for workflows to complete successfully")
 
     start_time = time.time()
+    poll_interval = WORKFLOW_POLL_INTERVAL
     while True:
-        # Fetch all workflows, filter out failed ones, then narrow by name.
-        all_workflow_runs = _fetch_all_workflow_runs(commit_sha)
-        if workflow_name:
-            all_workflow_runs = _filter_workflows_by_name(
-                all_workflow_runs, workflow_name
-            )
+        # Fetch all workflows, leaving out failed ones and other workflows.
+        all_workflow_runs = _fetch_latest_workflow_runs(commit_sha, workflow_name)
 
         if all_workflow_runs:
-            # Sort workflow runs by ID (latest first), then pick the best one.
-            sorted_runs = sorted(all_workflow_runs, key=lambda x: x["id"], reverse=True)
+            # Only the most recent workflow run (highest ID) is considered.
+            latest_run = max(all_workflow_runs, key=operator.itemgetter("id"))
             remaining = max(0.0, MAX_WAIT_TIME - (time.time() - start_time))
             return _find_best_workflow_run(
-                sorted_runs,
+                latest_run,
                 wait_for_success=wait_for_success,
                 max_wait_time=remaining,
             )
@@ -241,82 +473,185 @@ def get_last_successful_workflow_for_commit(
         if not wait_for_success or time.time() - start_time >= MAX_WAIT_TIME:
             return _handle_no_workflows_found(commit_sha, workflow_name)
 
+        remaining = MAX_WAIT_TIME - (time.time() - start_time)
+        wait_time = min(_with_jitter(poll_interval), max(remaining, 0))
         logger.info(
             f"No workflow run listed for commit {commit_sha} yet, "
-            f"retrying in {WORKFLOW_POLL_INTERVAL}s"
+            f"retrying in {wait_time:.0f}s"
         )
-        time.sleep(WORKFLOW_POLL_INTERVAL)
+        time.sleep(wait_time)
+        poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
 
 
-def _fetch_all_workflow_runs(
-    commit_sha: str,
-) -> list[dict[str, Any]]:
-    """Fetch all workflow runs for a commit and filter out only failed/cancelled ones."""
-    base_url = f"{api_url}/repos/{repository}/actions/runs"
-    params = f"?head_sha={commit_sha}&per_page={PER_PAGE}"
-    url = base_url + params
+@functools.lru_cache
+def _resolve_workflow_id(workflow_name: str) -> int | None:
+    """Look up the id of the workflow with the given name.
 
-    all_workflow_runs = []
-    page_count = 0
+    GITHUB_WORKFLOW holds the workflow name, or the workflow file path when the
+    workflow does not set a name, so both are matched.
 
+    Returns:
+        The workflow id, or None when no single workflow matches the name.
+    """
+    url = f"{api_url}/repos/{repository}/actions/workflows?per_page={PER_PAGE}"
+    matching_ids = []
     while url:
-        page_count += 1
-        logger.debug(f"Fetching workflows page {page_count} from: {url}")
-
-        response = _make_request_with_retry(url, headers)
-        data = response.json()
-        page_runs = data.get("workflow_runs", [])
-
-        # Filter out only failed/cancelled workflows
-        # Keep successful, in-progress, and other states that might transition to success
-        filtered_runs = [
-            run
-            for run in page_runs
-            if not (
-                run.get("status") == "completed"
-                and run.get("conclusion") in ("failure", "cancelled", "skipped")
-            )
-        ]
-        all_workflow_runs.extend(filtered_runs)
+        data, link_header = _get_json(url)
+        matching_ids.extend(
+            workflow["id"]
+            for workflow in data.get("workflows", [])
+            if workflow_name in (workflow.get("name"), workflow.get("path"))
+        )
+        url = _parse_link_header(link_header).get("next")
+
+    if len(matching_ids) != 1:
+        logger.info(
+            f"Found {len(matching_ids)} workflows named '{workflow_name}', "
+            "listing runs of all workflows"
+        )
+        return None
+
+    return matching_ids[0]
+
+
+def _keep_candidate_runs(
+    page_runs: list[dict[str, Any]],
+    workflow_name: str | None,
+) -> list[dict[str, Any]]:
+    """Drop failed/cancelled runs and, when a name is given, runs of other workflows."""
+    # Keep successful, in-progress, and other states that might transition to success
+    return [
+        run
+        for run in page_runs
+        if not (
+            run.get("status") == "completed"
+            and run.get("conclusion") in _FAILED_CONCLUSIONS
+        )
+        and (not workflow_name or run.get("name") == workflow_name)
+    ]
 
-        logger.debug(
-            f"Page {page_count}: fetched {len(page_runs)} runs, "
-            f"kept {len(filtered_runs)} (excluding failed/cancelled)"
+
+def _fetch_latest_workflow_runs(
+    commit_sha: str,
+    workflow_name: str | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch the most recent workflow runs for a commit, leaving out failed/cancelled ones.
+
+    When a workflow name is given, runs of other workflows are dropped per page.
+    Only the runs of the first page that keeps any run are returned: GitHub
+    returns runs newest first, so later pages only hold older runs.
+    """
+    # Pull request details are never read, leave them out of every listed run
+    params = f"?head_sha={commit_sha}&per_page={PER_PAGE}&exclude_pull_requests=true"
+    url = f"{api_url}/repos/{repository}/actions/runs{params}"
+    workflow_runs, page_count = _fetch_first_workflow_runs_page(url, workflow_name)
+    pages_requested = 1
+
+    # Only when older pages are needed is the workflow id worth a lookup: listing
+    # the runs of that workflow alone may then save a number of pages.
+    workflow_id = (
+        _resolve_workflow_id(workflow_name)
+        if workflow_name and not workflow_runs and page_count > 1
+        else None
+    )
+    if workflow_id:
+        url = (
+            f"{api_url}/repos/{repository}/actions/workflows/{workflow_id}/runs{params}"
         )
+        workflow_runs, page_count = _fetch_first_workflow_runs_page(url, workflow_name)
+        pages_requested += 1
 
-        links = _parse_link_header(response.headers.get("Link"))
-        url = links.get("next")
-        if not url:
-            logger.debug("No more pages to fetch")
-            break
+    if not workflow_runs and page_count > 1:
+        workflow_runs, older_pages_requested = _fetch_older_workflow_runs(
+            url, page_count, workflow_name
+        )
+        pages_requested += older_pages_requested
 
     logger.info(
-        f"Found {len(all_workflow_runs)} workflow runs (excluding failed/cancelled) across {page_count} page(s)"
+        f"Found {len(workflow_runs)} workflow runs (excluding failed/cancelled) "
+        f"after requesting {pages_requested} page(s)"
     )
-    return all_workflow_runs
+    if workflow_name:
+        logger.info(
+            f"Filtered to {len(workflow_runs)} runs for workflow '{workflow_name}'"
+        )
+    return workflow_runs
 
 
-def _filter_workflows_by_name(
-    workflow_runs: list[dict[str, Any]], workflow_name: str
-) -> list[dict[str, Any]]:
-    """Filter workflow runs by workflow name."""
-    filtered = [run for run in workflow_runs if run.get("name") == workflow_name]
-    logger.info(f"Filtered to {len(filtered)} runs for workflow '{workflow_name}'")
-    return filtered
+def _fetch_first_workflow_runs_page(
+    url: str,
+    workflow_name: str | None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Fetch the first page of a runs listing.
+
+    Returns:
+        The runs kept from that page, and the number of pages in the listing.
+    """
+    logger.debug("Fetching workflows page 1 from: %s", url)
+    data, _ = _get_json(url)
+    page_runs = data.get("workflow_runs", [])
+    workflow_runs = _keep_candidate_runs(page_runs, workflow_name)
+    logger.debug(
+        "Page 1: fetched %d runs, kept %d (excluding failed/cancelled)",
+        len(page_runs),
+        len(workflow_runs),
+    )
+    return workflow_runs, -(-data.get("total_count", 0) // PER_PAGE)
+
+
+def _fetch_older_workflow_runs(
+    url: str,
+    page_count: int,
+    workflow_name: str | None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Fetch pages 2 to page_count concurrently, returning the first kept runs.
+
+    Pages are requested by a small thread pool so their round trips overlap, but
+    inspected in order. Once a page keeps any run, or fails, pages not yet
+    requested are cancelled.
+
+    Returns:
+        The runs kept from the first page keeping any, and the number of pages
+        that were requested.
+    """
+    workflow_runs = []
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+        pages = [
+            executor.submit(_get_json, f"{url}&page={page}")
+            for page in range(2, page_count + 1)
+        ]
+        try:
+            for page, future in enumerate(pages, start=2):
+                data, _ = future.result()
+                page_runs = data.get("workflow_runs", [])
+                workflow_runs = _keep_candidate_runs(page_runs, workflow_name)
+                logger.debug(
+                    "Page %d: fetched %d runs, kept %d (excluding failed/cancelled)",
+                    page,
+                    len(page_runs),
+                    len(workflow_runs),
+                )
+                if workflow_runs:
+                    break
+        finally:
+            # Leaving the with block would otherwise still request every queued page
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Pages still queued when the listing stopped were cancelled, never requested
+    return workflow_runs, sum(not future.cancelled() for future in pages)
 
 
 def _find_best_workflow_run(
-    sorted_runs: list[dict[str, Any]],
+    latest_run: dict[str, Any],
     *,
     wait_for_success: bool,
     max_wait_time: float = MAX_WAIT_TIME,
 ) -> dict[str, Any] | None:
-    """Find the best workflow run based on the current configuration."""
-    if not sorted_runs:
-        return None
+    """Find the best workflow run based on the current configuration.
 
-    # The most recent workflow run (highest ID)
-    latest_run = sorted_runs[0]
+    Args:
+        latest_run: the most recent workflow run (highest ID) for the commit.
+    """
     status = latest_run.get("status")
     conclusion = latest_run.get("conclusion")
 
@@ -328,14 +663,7 @@ def _find_best_workflow_run(
         return latest_run
 
     # If the latest run is in progress or other non-final state
-    if status in [
-        "in_progress",
-        "action_required",
-        "queued",
-        "requested",
-        "waiting",
-        "pending",
-    ]:
+    if status in _IN_PROGRESS_STATUSES:
         if not wait_for_success:
             # Return immediately with the in-progress workflow
             logger.info(
@@ -373,11 +701,12 @@ def _handle_no_workflows_found(
 
 def _get_artifact_metadata(run_id: str, artifact_name: str) -> dict[str, Any]:
     """Get artifact metadata from workflow run."""
-    url = f"{api_url}/repos/{repository}/actions/runs/{run_id}/artifacts"
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-
-    data = response.json()
+    # GitHub filters on the exact name, the scan below only guards against surprises
+    url = (
+        f"{api_url}/repos/{repository}/actions/runs/{run_id}/artifacts"
+        f"?name={quote(artifact_name, safe='')}"
+    )
+    data, _ = _get_json(url)
     artifacts = data.get("artifacts", [])
 
     # Find the artifact by name
@@ -393,17 +722,22 @@ def _get_artifact_metadata(run_id: str, artifact_name: str) -> dict[str, Any]:
     raise ValueError(f"Artifact '{artifact_name}' not found in workflow run {run_id}")
 
 
-def _extract_zip_content(zip_content: bytes, artifact_name: str) -> str:
-    """Extract content from zip file."""
-    with zipfile.ZipFile(io.BytesIO(zip_content)) as zip_file:
-        # Assume the artifact contains a single file with the version
-        for file_name in zip_file.namelist():
-            if file_name == artifact_name or file_name.endswith(f"/{artifact_name}"):
-                return zip_file.read(file_name).decode("utf-8").rstrip()
+def _extract_zip_content(zip_content: IO[bytes], artifact_name: str) -> str:
+    """Extract content from a seekable zip file object."""
+    with zipfile.ZipFile(zip_content) as zip_file:
+        # Assume the artifact contains a single file with the version. Walk the
+        # central directory once, preferring a member named after the artifact
+        # and falling back to the first member otherwise.
+        suffix = f"/{artifact_name}"
+        chosen = None
+        for info in zip_file.infolist():
+            if info.filename == artifact_name or info.filename.endswith(suffix):
+                chosen = info
+                break
+            chosen = chosen or info
 
-        # If exact match not found, try the first file
-        if zip_file.namelist():
-            return zip_file.read(zip_file.namelist()[0]).decode("utf-8").rstrip()
+        if chosen:
+            return zip_file.read(chosen).decode("utf-8").rstrip()
 
     raise ValueError(f"No content found in artifact '{artifact_name}'")
 
@@ -420,38 +754,57 @@ def download_artifact(run_id: str, artifact_name: str) -> str:
         str: content of the downloaded artifact.
             (ex.: https://docs.github.com/en/rest/actions/artifacts)
     """
-    try:
-        session = None
-        # Get artifact metadata
-        target_artifact = _get_artifact_metadata(run_id, artifact_name)
-        logger.info(
-            f"Found artifact '{artifact_name}' with ID: {target_artifact['id']}"
-        )
-
-        download_url = f"{api_url}/repos/{repository}/actions/artifacts/{target_artifact['id']}/zip"
+    artifact_cache_path = _artifact_cache_path(run_id, artifact_name)
+    if artifact_cache_path and artifact_cache_path.is_file():
+        logger.info(f"Using cached artifact '{artifact_name}' of run {run_id}")
+        return artifact_cache_path.read_text()
 
-        # Use requests session to handle redirects with proper auth header logic
-        session = requests.Session()
+    # Get artifact metadata
+    target_artifact = _get_artifact_metadata(run_id, artifact_name)
+    logger.info(f"Found artifact '{artifact_name}' with ID: {target_artifact['id']}")
 
-        # Mount the custom adapter
-        session.mount("http://", GitHubAuthRedirectAdapter(download_url, headers))
-        session.mount("https://", GitHubAuthRedirectAdapter(download_url, headers))
+    download_url = (
+        f"{api_url}/repos/{repository}/actions/artifacts/{target_artifact['id']}/zip"
+    )
 
-        # Make the request with the session (will handle redirects automatically)
-        response = session.get(download_url, timeout=30)
+    # The session follows the redirect to the storage host without the auth header.
+    # The zip is streamed into a spooled file rather than buffered as a whole.
+    with (
+        _SESSION.get(download_url, timeout=30, stream=True) as response,
+        tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE) as zip_content,
+    ):
         response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            zip_content.write(chunk)
+        zip_content.seek(0)
 
         # Extract and return content
-        return _extract_zip_content(response.content, artifact_name)
-    finally:
-        # Clean up session
-        try:
-            if "session" in locals() and session is not None:
-                session.close()
-        except (AttributeError, OSError) as e:
-            # Log the exception but don't let it propagate since we're in cleanup
-            # Only catch specific exceptions that might occur during session.close()
-            logger.warning(f"Failed to close session during cleanup: {e}")
+        content = _extract_zip_content(zip_content, artifact_name)
+
+    if artifact_cache_path:
+        _write_cache_entry(artifact_cache_path, content)
+    return content
+
+
+def _log_request_error(
+    e: requests.exceptions.RequestException, artifact_name: str
+) -> None:
+    """Log why talking to the GitHub API failed, including the traceback."""
+    if not isinstance(e, requests.exceptions.HTTPError):
+        # Connection errors and timeouts are not retried, GitHub is likely unreachable
+        logger.error(f"Could not reach the GitHub API at {api_url}", exc_info=e)
+    elif e.response is not None and e.response.status_code == HTTP_FORBIDDEN:
+        error_msg = (
+            f"403 Forbidden when downloading artifact '{artifact_name}'. "
+            f"This could be due to: Insufficient permissions (ensure GITHUB_TOKEN has 'actions:read' scope), "
+            f"Original error: {e}"
+        )
+        logger.error(error_msg, exc_info=e)
+    else:
+        logger.error(
+            f"HTTP error occurred: {e.response.status_code if e.response is not None else 'Unknown'}",
+            exc_info=e,
+        )
 
 
 def main(commit_sha: str, artifact_name: str, workflow_name: str | None = None) -> int:
@@ -473,6 +826,14 @@ def main(commit_sha: str, artifact_name: str, workflow_name: str | None = None)
     """
     logging.basicConfig(level=logging.INFO)
 
+    # A previous invocation in this job already resolved the artifact for this commit
+    version_cache_path = _version_cache_path(commit_sha, artifact_name, workflow_name)
+    if version_cache_path and version_cache_path.is_file():
+        version = version_cache_path.read_text()
+        logger.info(f"found cached version for commit {commit_sha}: {version}")
+        print(version)  # print result to stdout
+        return 0
+
     try:
         last_workflow_run = get_last_successful_workflow_for_commit(
             commit_sha, workflow_name
@@ -491,21 +852,18 @@ def main(commit_sha: str, artifact_name: str, workflow_name: str | None = None)
                 logger.warning(f"Could not download artifact: {e}")
             else:
                 logger.info(f"found version from artifact: {version}")
+                # An in-progress run returned without waiting may still fail, only
+                # the artifact of a successful run can be reused by a later caller
+                if (
+                    version_cache_path
+                    and last_workflow_run.get("conclusion") == "success"
+                ):
+                    _write_cache_entry(version_cache_path, version)
                 print(version)  # print result to stdout
                 return 0
 
-    except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == HTTP_FORBIDDEN:
-            error_msg = (
-                f"403 Forbidden when downloading artifact '{artifact_name}'. "
-                f"This could be due to: Insufficient permissions (ensure GITHUB_TOKEN has 'actions:read' scope), "
-                f"Original error: {e}"
-            )
-            logger.exception(error_msg)
-        else:
-            logger.exception(
-                f"HTTP error occurred: {e.response.status_code if e.response else 'Unknown'}"
-            )
+    except requests.exceptions.RequestException as e:
+        _log_request_error(e, artifact_name)
 
     if not _should_wait_for_success():
         logger.error(
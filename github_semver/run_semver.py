@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import re
 import subprocess
 from pathlib import Path
 
@@ -9,20 +8,36 @@ from .bumps import append_rc, bump_build, bump_patch
 
 logger = logging.getLogger(__name__)
 
+# values of boolean environment settings that count as enabled
+_TRUTHY = frozenset({"true", "1", "yes"})
+
 
 def _retrieve_latest_tag_from_git() -> str | None:
     # raw tag is a line which is 'tab' separated, with hash on the left
     # tag on the right. tag is in a refs/tags/0.0.x or refs/tags/v0.0.x format.
+    # only tags starting with a digit, optionally after a 'v', are listed at all.
     raw_output = subprocess.check_output(
-        "git ls-remote --refs --tags --sort='-v:refname'",
-        shell=True,
-    ).decode()
-    logger.debug(f"shell output is: {raw_output}")
+        [
+            "git",
+            "ls-remote",
+            "--refs",
+            "--tags",
+            "--sort=-v:refname",
+            "origin",
+            "refs/tags/[0-9]*",
+            "refs/tags/v[0-9]*",
+        ],
+        text=True,
+    )
+    logger.debug("shell output is: %s", raw_output)
     tag_lines = raw_output.splitlines()
     for tag in tag_lines:
+        _, sep, ref = tag.partition("\trefs/tags/")
         # an optional leading 'v' is stripped so 0.0.1 and v0.0.1 both match.
-        if semver_match := re.search(r"refs/tags/v?([0-9]+\..*)", tag):
-            return semver_match.group(1)
+        version = ref.removeprefix("v")
+        major, dot, _ = version.partition(".")
+        if sep and dot and major.isascii() and major.isdigit():
+            return version
 
     return None
 
@@ -43,21 +58,15 @@ def _get_pr_head_sha() -> str:
 
 def _extract_branch_and_sha() -> tuple[str, str]:
     """Extract branch name and SHA based on GitHub context."""
-    github_ref = os.environ["GITHUB_REF"]
-    github_ref_name = os.environ.get("GITHUB_REF_NAME", "")
     github_head_ref = os.environ.get("GITHUB_HEAD_REF", "")
 
     if github_head_ref:
         # This is a pull request - use the head SHA, not the merge SHA
         branch = github_head_ref
         commit_sha = _get_pr_head_sha()
-    elif github_ref.startswith("refs/heads/"):
-        # This is a push to a branch - use GITHUB_SHA normally
-        branch = github_ref_name
-        commit_sha = os.environ["GITHUB_SHA"][:7]
     else:
-        # Fallback to ref name
-        branch = github_ref_name
+        # A push to a branch, or any other ref - use the ref name and GITHUB_SHA
+        branch = os.environ.get("GITHUB_REF_NAME", "")
         commit_sha = os.environ["GITHUB_SHA"][:7]
 
     return branch, commit_sha
@@ -77,11 +86,7 @@ def main() -> None:
 
         # if 'RC' building is enabled, 'rc' suffix will be added
         # on generate semver.
-        build_rc_semver = os.getenv("BUILD_RC_SEMVER", "True").lower() in (
-            "true",
-            "1",
-            "yes",
-        )
+        build_rc_semver = os.getenv("BUILD_RC_SEMVER", "True").lower() in _TRUTHY
     except KeyError as e:
         raise RuntimeError("expected environment values are not set.") from e
 
@@ -89,7 +94,7 @@ def main() -> None:
         try:
             if not (latest_tag := _retrieve_latest_tag_from_git()):
                 latest_tag = "0.0.1"
-            logger.info(f"latest tag is {latest_tag}")
+            logger.info("latest tag is %s", latest_tag)
         except subprocess.CalledProcessError as e:
             raise RuntimeError(
                 f"command '{e.cmd}' return with error (code {e.returncode}): {e.output}"
@@ -103,7 +108,7 @@ def main() -> None:
         logger.info("building on a feature branch, bump build number")
         new_version = bump_build("0.0.0", branch, commit_sha, build_number)
 
-    logger.info(f"new version is {new_version}")
+    logger.info("new version is %s", new_version)
     print(new_version)
 
 
@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def github_env(monkeypatch):
+    """Provide the GitHub Actions environment the commit_version tests expect.
+
+    Settings read at call time are removed so the runner's own environment cannot
+    change the outcome of a test.
+    """
+    monkeypatch.setenv("GITHUB_REPOSITORY", "owner/repo")
+    monkeypatch.setenv("GITHUB_TOKEN", "test_token")
+    for name in ("DO_NOT_WAIT_FOR_SUCCESS", "RUNNER_TEMP"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def mock_get():
+    """Mock the GET method of the session shared by all GitHub API calls."""
+    with patch("github_semver.commit_version._SESSION.get") as mock:
+        yield mock
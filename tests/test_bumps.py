@@ -215,6 +215,13 @@ class TestBumpBuild:
         expected = "1.2.4-build.42+featurefixissue123specialchars.abc123def456"
         assert result == expected
 
+    def test_bump_build_strips_non_ascii_branch_characters(self):
+        """Test that non-ASCII letters and digits are removed from branch names."""
+        result = bump_build(BASIC_VERSION, "féature/ü-2²", COMMIT_SHA, BUILD_NUMBER)
+
+        expected = "1.2.4-build.42+fature2.abc123def456"
+        assert result == expected
+
     def test_bump_build_with_string_build_number(self):
         """Test bump_build with string build number."""
         result = bump_build(BASIC_VERSION, BRANCH_NAME, COMMIT_SHA, "123")
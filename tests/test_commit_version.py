@@ -1,11 +1,29 @@
+import io
+import logging
 import os
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
 
 from github_semver.commit_version import (
+    MAX_PAGE_WORKERS,
+    MAX_WAIT_TIME,
+    _extract_zip_content,
+    _make_request_with_retry,
+    _rate_limit,
+    _resolve_workflow_id,
+    _response_cache,
+    _wait_for_workflow_completion,
     download_artifact,
     get_last_successful_workflow_for_commit,
+    get_session,
+    main,
 )
 
 # Test constants
@@ -16,35 +34,81 @@ SUCCESSFUL_WORKFLOW_ID = 100
 OLDER_SUCCESSFUL_WORKFLOW_ID = 101
 LATEST_IN_PROGRESS_WORKFLOW_ID = 102
 EXPECTED_API_CALL_COUNT = 2
+BUILD_WORKFLOW_ID = 7
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+def make_zip(members: dict[str, str]) -> bytes:
+    """Build an in-memory zip archive holding the given members."""
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+        for name, content in members.items():
+            zip_file.writestr(name, content)
+    return zip_buffer.getvalue()
+
+
+# Artifact zip as uploaded by the version workflow, built once for all tests
+VERSION_ZIP = make_zip({"version": "1.2.3\n"})
+
+
+def make_download_response(content: bytes) -> MagicMock:
+    """Build a streamed artifact download response delivering the given content."""
+    download_response = MagicMock()
+    download_response.__enter__.return_value = download_response
+    download_response.raise_for_status.return_value = None
+    # Deliver the content in two chunks, as a streamed response would
+    middle = len(content) // 2
+    download_response.iter_content.return_value = [content[:middle], content[middle:]]
+    return download_response
+
+
+@dataclass
+class FakeResponse:
+    """Stand-in for the API responses returned by the mocked session."""
+
+    json_data: Any = None
+    status_code: int = 200
+    headers: dict[str, Any] = field(default_factory=dict)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:  # noqa: PLR2004
+            raise requests.exceptions.HTTPError(response=self)
+
+    def json(self) -> Any:
+        # A response without a body, such as a 304, must not be decoded
+        if self.json_data is None:
+            msg = f"{self.status_code} response has no JSON body"
+            raise ValueError(msg)
+        return self.json_data
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    # Workflow ids and responses are cached per process, don't leak them
+    _resolve_workflow_id.cache_clear()
+    _response_cache.clear()
+
+
+@pytest.mark.usefixtures("github_env")
 def test_get_last_successful_workflow_for_commit(mock_get):
     # Mock single response with all workflows
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}  # No pagination
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {"id": 123, "status": "completed", "conclusion": "success"},
-            {
-                "id": EXPECTED_LATEST_WORKFLOW_ID,
-                "status": "completed",
-                "conclusion": "success",
-            },
-            {
-                "id": 100,
-                "status": "completed",
-                "conclusion": "failure",
-            },  # Should be filtered out
-        ]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {"id": 123, "status": "completed", "conclusion": "success"},
+                {
+                    "id": EXPECTED_LATEST_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+                {
+                    "id": 100,
+                    "status": "completed",
+                    "conclusion": "failure",
+                },  # Should be filtered out
+            ]
+        },
+        headers={"Link": None},  # No pagination
+    )
 
     mock_get.return_value = mock_response
 
@@ -55,105 +119,214 @@ def test_get_last_successful_workflow_for_commit(mock_get):
     # Verify the request was made with per_page parameter
     call_args = mock_get.call_args[0][0]
     assert "per_page=100" in call_args
+    assert "exclude_pull_requests=true" in call_args
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 def test_download_artifact_expired_error(mock_get):
     # Mock response with expired artifact
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "artifacts": [{"id": EXPECTED_ARTIFACT_ID, "name": "version", "expired": True}]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "artifacts": [
+                {"id": EXPECTED_ARTIFACT_ID, "name": "version", "expired": True}
+            ]
+        },
+    )
     mock_get.return_value = mock_response
 
     with pytest.raises(ValueError, match="expired"):
         download_artifact("456", "version")
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
+def test_download_artifact_streams_zip_content(mock_get):
+    metadata_response = FakeResponse(
+        json_data={"artifacts": [{"id": EXPECTED_ARTIFACT_ID, "name": "version"}]},
+    )
+
+    download_response = make_download_response(VERSION_ZIP)
+
+    mock_get.side_effect = [metadata_response, download_response]
+
+    assert download_artifact("456", "version") == "1.2.3"
+    metadata_call = mock_get.call_args_list[0]
+    assert metadata_call[0][0].endswith("/runs/456/artifacts?name=version")
+    download_call = mock_get.call_args_list[1]
+    assert download_call[0][0].endswith(f"/artifacts/{EXPECTED_ARTIFACT_ID}/zip")
+    assert download_call[1]["stream"] is True
+
+
+def test_download_artifact_reuses_downloaded_content(mock_get, tmp_path):
+    metadata_response = FakeResponse(
+        json_data={"artifacts": [{"id": EXPECTED_ARTIFACT_ID, "name": "version"}]},
+    )
+
+    download_response = make_download_response(VERSION_ZIP)
+
+    mock_get.side_effect = [metadata_response, download_response]
+
+    with patch.dict(os.environ, {"RUNNER_TEMP": str(tmp_path)}):
+        assert download_artifact("456", "version") == "1.2.3"
+        assert download_artifact("456", "version") == "1.2.3"
+
+    # The second download is served from the cache without any request
+    assert mock_get.call_count == EXPECTED_API_CALL_COUNT
+
+
+def test_extract_zip_content_prefers_member_named_after_artifact():
+    zip_content = make_zip(
+        {"logs/build.txt": "not the version", "dist/version": "2.0.0\n"}
+    )
+
+    assert _extract_zip_content(io.BytesIO(zip_content), "version") == "2.0.0"
+
+
+def test_extract_zip_content_falls_back_to_first_member():
+    zip_content = make_zip({"VERSION.txt": "3.0.0\n", "notes.txt": "release notes"})
+
+    assert _extract_zip_content(io.BytesIO(zip_content), "version") == "3.0.0"
+
+
+@pytest.mark.usefixtures("github_env")
 def test_get_workflow_with_pagination(mock_get):
-    # Create responses for multiple pages with mixed statuses
-    page1_response = MagicMock()
-    page1_response.status_code = 200
-    page1_response.headers = {
-        "Link": '<https://api.github.com/repos/owner/repo/actions/runs?page=2>; rel="next"'
-    }
-    page1_response.raise_for_status.return_value = None
-    workflow_runs_page1 = []
+    # Runs are listed newest first; the first page only holds failed runs
+    page1_response = FakeResponse(
+        json_data={
+            "total_count": 250,
+            "workflow_runs": [
+                {"id": 449 - i, "status": "completed", "conclusion": "failure"}
+                for i in range(100)
+            ],
+        },
+        headers={
+            "Link": '<https://api.github.com/repos/owner/repo/actions/runs?page=2>; rel="next"'
+        },
+    )
+
+    workflow_runs_page2 = []
     for i in range(100):
         if i % 3 == 0:  # Some failed workflows that should be filtered
-            workflow_runs_page1.append(
-                {"id": 100 + i, "status": "completed", "conclusion": "failure"}
+            workflow_runs_page2.append(
+                {"id": 349 - i, "status": "completed", "conclusion": "failure"}
             )
         else:
-            workflow_runs_page1.append(
-                {"id": 100 + i, "status": "completed", "conclusion": "success"}
+            workflow_runs_page2.append(
+                {"id": 349 - i, "status": "completed", "conclusion": "success"}
             )
-    page1_response.json.return_value = {"workflow_runs": workflow_runs_page1}
+    page2_response = FakeResponse(
+        json_data={
+            "total_count": 250,
+            "workflow_runs": workflow_runs_page2,
+        },
+    )
+
+    page3_response = FakeResponse(
+        json_data={
+            "total_count": 250,
+            "workflow_runs": [
+                {"id": 249 - i, "status": "completed", "conclusion": "success"}
+                for i in range(50)
+            ],
+        },
+    )
+
+    # Pages 2 and 3 are requested concurrently, so answer by URL rather than order
+    def get_page(url, **_kwargs):
+        if url.endswith("&page=3"):
+            return page3_response
+        if url.endswith("&page=2"):
+            return page2_response
+        return page1_response
+
+    mock_get.side_effect = get_page
 
-    page2_response = MagicMock()
-    page2_response.status_code = 200
-    page2_response.headers = {
-        "Link": '<https://api.github.com/repos/owner/repo/actions/runs?page=3>; rel="next"'
-    }
-    page2_response.raise_for_status.return_value = None
-    page2_response.json.return_value = {
-        "workflow_runs": [
-            {"id": 200 + i, "status": "completed", "conclusion": "success"}
-            for i in range(100)
-        ]
-    }
-
-    page3_response = MagicMock()
-    page3_response.status_code = 200
-    page3_response.headers = {"Link": None}  # Last page
-    page3_response.raise_for_status.return_value = None
-    page3_response.json.return_value = {
-        "workflow_runs": [
-            {"id": 300 + i, "status": "completed", "conclusion": "success"}
-            for i in range(50)
-        ]
-    }
+    result = get_last_successful_workflow_for_commit("abc123")
 
-    mock_get.side_effect = [page1_response, page2_response, page3_response]
+    assert result is not None
+    assert result["id"] == 348  # The latest successful run on page 2  # noqa: PLR2004
+    requested_urls = [call[0][0] for call in mock_get.call_args_list]
+    assert "&page=" not in requested_urls[0]
+    assert any(url.endswith("&page=2") for url in requested_urls)
+
+
+@pytest.mark.usefixtures("github_env")
+def test_pagination_short_circuits_on_first_success(mock_get):
+    page1_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {"id": 201, "status": "completed", "conclusion": "failure"},
+                {"id": 200, "status": "completed", "conclusion": "success"},
+            ]
+        },
+        headers={
+            "Link": '<https://api.github.com/repos/owner/repo/actions/runs?page=2>; rel="next"'
+        },
+    )
+
+    page2_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {"id": 100, "status": "completed", "conclusion": "success"}
+            ]
+        },
+        headers={"Link": None},
+    )
+
+    mock_get.side_effect = [page1_response, page2_response]
 
     result = get_last_successful_workflow_for_commit("abc123")
 
     assert result is not None
-    assert result["id"] == 349  # The highest ID from page 3  # noqa: PLR2004
-    assert mock_get.call_count == 3  # Should have made 3 requests  # noqa: PLR2004
+    assert result["id"] == 200  # noqa: PLR2004
+    assert mock_get.call_count == 1
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
+def test_pagination_stops_requesting_pages_after_a_page_fails(mock_get):
+    page1_response = FakeResponse(
+        json_data={
+            "total_count": 3000,
+            "workflow_runs": [
+                {"id": 3000 - i, "status": "completed", "conclusion": "failure"}
+                for i in range(100)
+            ],
+        },
+    )
+    older_page_response = FakeResponse(json_data={"workflow_runs": []})
+    requested_pages = []
+
+    def get_page(url, **_kwargs):
+        _, _, page = url.partition("&page=")
+        if not page:
+            return page1_response
+        requested_pages.append(int(page))
+        if page == "2":
+            return FakeResponse(status_code=404)
+        # Keep the other workers busy until the failure on page 2 is seen
+        time.sleep(0.05)
+        return older_page_response
+
+    mock_get.side_effect = get_page
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        get_last_successful_workflow_for_commit("abc123")
+
+    # Only the pages already picked up by a worker were requested, not all 30
+    assert max(requested_pages) <= 2 + MAX_PAGE_WORKERS
+
+
+@pytest.mark.usefixtures("github_env")
 def test_get_workflow_single_page(mock_get):
     # Test case where all results fit in a single page (no pagination needed)
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}  # No next page
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {"id": 100 + i, "status": "completed", "conclusion": "success"}
-            for i in range(30)
-        ]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {"id": 100 + i, "status": "completed", "conclusion": "success"}
+                for i in range(30)
+            ]
+        },
+        headers={"Link": None},  # No next page
+    )
 
     mock_get.return_value = mock_response
 
@@ -164,41 +337,40 @@ def test_get_workflow_single_page(mock_get):
     assert mock_get.call_count == 1  # Should only make 1 request
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 def test_get_workflow_with_name_filter(mock_get):
     # Mock response with multiple workflow types
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": 100,
-                "name": "build",
-                "status": "completed",
-                "conclusion": "success",
-            },
-            {"id": 101, "name": "test", "status": "completed", "conclusion": "success"},
-            {
-                "id": 102,
-                "name": "build",
-                "status": "completed",
-                "conclusion": "success",
-            },
-            {
-                "id": 103,
-                "name": "deploy",
-                "status": "completed",
-                "conclusion": "success",
-            },
-        ]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": 100,
+                    "name": "build",
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+                {
+                    "id": 101,
+                    "name": "test",
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+                {
+                    "id": 102,
+                    "name": "build",
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+                {
+                    "id": 103,
+                    "name": "deploy",
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+            ]
+        },
+        headers={"Link": None},
+    )
 
     mock_get.return_value = mock_response
 
@@ -209,32 +381,27 @@ def test_get_workflow_with_name_filter(mock_get):
     assert result["name"] == "build"
 
 
-@patch.dict(
-    os.environ,
-    {
-        "GITHUB_REPOSITORY": "owner/repo",
-        "GITHUB_TOKEN": "test_token",
-        "DO_NOT_WAIT_FOR_SUCCESS": "true",
-    },
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
-def test_do_not_wait_for_success_returns_in_progress(mock_get):
+@pytest.mark.usefixtures("github_env")
+def test_do_not_wait_for_success_returns_in_progress(mock_get, monkeypatch):
     # Test that when DO_NOT_WAIT_FOR_SUCCESS=true, in-progress workflows are returned immediately
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {"id": SUCCESSFUL_WORKFLOW_ID, "status": "in_progress", "conclusion": None},
-            {
-                "id": 99,
-                "status": "completed",
-                "conclusion": "failure",
-            },  # Should be filtered out
-        ]
-    }
+    monkeypatch.setenv("DO_NOT_WAIT_FOR_SUCCESS", "true")
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "in_progress",
+                    "conclusion": None,
+                },
+                {
+                    "id": 99,
+                    "status": "completed",
+                    "conclusion": "failure",
+                },  # Should be filtered out
+            ]
+        },
+        headers={"Link": None},
+    )
 
     mock_get.return_value = mock_response
 
@@ -246,36 +413,27 @@ def test_do_not_wait_for_success_returns_in_progress(mock_get):
     # Should return immediately without waiting
 
 
-@patch.dict(
-    os.environ,
-    {
-        "GITHUB_REPOSITORY": "owner/repo",
-        "GITHUB_TOKEN": "test_token",
-        "DO_NOT_WAIT_FOR_SUCCESS": "true",
-    },
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
-def test_do_not_wait_returns_latest_failed_with_older_successful(mock_get):
+@pytest.mark.usefixtures("github_env")
+def test_do_not_wait_returns_latest_failed_with_older_successful(mock_get, monkeypatch):
     # Test that DO_NOT_WAIT_FOR_SUCCESS=true returns latest even if it failed (with older successful available)
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": 102,
-                "status": "completed",
-                "conclusion": "failure",
-            },  # Latest, failed
-            {
-                "id": 101,
-                "status": "completed",
-                "conclusion": "success",
-            },  # Older, successful
-        ]
-    }
+    monkeypatch.setenv("DO_NOT_WAIT_FOR_SUCCESS", "true")
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": 102,
+                    "status": "completed",
+                    "conclusion": "failure",
+                },  # Latest, failed
+                {
+                    "id": 101,
+                    "status": "completed",
+                    "conclusion": "success",
+                },  # Older, successful
+            ]
+        },
+        headers={"Link": None},
+    )
 
     mock_get.return_value = mock_response
 
@@ -287,37 +445,31 @@ def test_do_not_wait_returns_latest_failed_with_older_successful(mock_get):
     )  # Should still use the older successful one, not the failed latest
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 def test_standard_behavior_fetches_all_workflows(mock_get):
     # Test that standard behavior fetches all workflows and filters failed ones
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": SUCCESSFUL_WORKFLOW_ID,
-                "status": "completed",
-                "conclusion": "success",
-            },
-            {
-                "id": 99,
-                "status": "completed",
-                "conclusion": "failure",
-            },  # Should be filtered out
-            {
-                "id": 98,
-                "status": "completed",
-                "conclusion": "cancelled",
-            },  # Should be filtered out
-        ]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+                {
+                    "id": 99,
+                    "status": "completed",
+                    "conclusion": "failure",
+                },  # Should be filtered out
+                {
+                    "id": 98,
+                    "status": "completed",
+                    "conclusion": "cancelled",
+                },  # Should be filtered out
+            ]
+        },
+        headers={"Link": None},
+    )
 
     mock_get.return_value = mock_response
 
@@ -333,37 +485,31 @@ def test_standard_behavior_fetches_all_workflows(mock_get):
     assert "status=in_progress" not in call_args
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 def test_latest_failed_uses_older_successful(mock_get):
     # Test when latest workflow failed but older successful exists
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.headers = {"Link": None}
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": 102,
-                "status": "completed",
-                "conclusion": "failure",
-            },  # Latest, failed
-            {
-                "id": 101,
-                "status": "completed",
-                "conclusion": "success",
-            },  # Older, successful
-            {
-                "id": SUCCESSFUL_WORKFLOW_ID,
-                "status": "completed",
-                "conclusion": "success",
-            },
-        ]
-    }
+    mock_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": 102,
+                    "status": "completed",
+                    "conclusion": "failure",
+                },  # Latest, failed
+                {
+                    "id": 101,
+                    "status": "completed",
+                    "conclusion": "success",
+                },  # Older, successful
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                },
+            ]
+        },
+        headers={"Link": None},
+    )
 
     mock_get.return_value = mock_response
 
@@ -375,47 +521,37 @@ def test_latest_failed_uses_older_successful(mock_get):
     )  # Should use the older successful one, not the latest failed
 
 
-@patch.dict(
-    os.environ,
-    {
-        "GITHUB_REPOSITORY": "owner/repo",
-        "GITHUB_TOKEN": "test_token",
-    },
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 @patch("github_semver.commit_version.time.sleep")
 def test_waits_for_latest_workflow_only(mock_sleep, mock_get):  # noqa: ARG001
     # Test that when waiting, only waits for the latest (most recent) workflow
     # First call returns in-progress workflow
-    initial_response = MagicMock()
-    initial_response.status_code = 200
-    initial_response.headers = {"Link": None}
-    initial_response.raise_for_status.return_value = None
-    initial_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": 102,
-                "status": "in_progress",
-                "conclusion": None,
-            },  # Latest, in-progress
-            {
-                "id": 101,
-                "status": "completed",
-                "conclusion": "success",
-            },  # Older, successful
-        ]
-    }
+    initial_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": 102,
+                    "status": "in_progress",
+                    "conclusion": None,
+                },  # Latest, in-progress
+                {
+                    "id": 101,
+                    "status": "completed",
+                    "conclusion": "success",
+                },  # Older, successful
+            ]
+        },
+        headers={"Link": None},
+    )
 
     # Second call (polling the specific workflow) returns completed
-    polling_response = MagicMock()
-    polling_response.status_code = 200
-    polling_response.raise_for_status.return_value = None
-    polling_response.json.return_value = {
-        "id": 102,
-        "status": "completed",
-        "conclusion": "success",
-    }
+    polling_response = FakeResponse(
+        json_data={
+            "id": 102,
+            "status": "completed",
+            "conclusion": "success",
+        },
+    )
 
     mock_get.side_effect = [initial_response, polling_response]
 
@@ -433,77 +569,429 @@ def test_waits_for_latest_workflow_only(mock_sleep, mock_get):  # noqa: ARG001
     assert f"/actions/runs/{LATEST_IN_PROGRESS_WORKFLOW_ID}" in second_call_url
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
-@patch("github_semver.commit_version.requests.get")
+@pytest.mark.usefixtures("github_env")
 @patch("github_semver.commit_version.time.sleep")
 def test_waits_for_workflow_run_to_appear(mock_sleep, mock_get):
     # The commit-filtered runs endpoint lags behind run creation, so the run
     # triggered alongside the caller is not listed on the first request.
-    empty_response = MagicMock()
-    empty_response.status_code = 200
-    empty_response.headers = {"Link": None}
-    empty_response.raise_for_status.return_value = None
-    empty_response.json.return_value = {"workflow_runs": []}
+    empty_response = FakeResponse(
+        json_data={"workflow_runs": []},
+        headers={"Link": None},
+    )
 
     # On the next poll the run is listed, still in progress.
-    appeared_response = MagicMock()
-    appeared_response.status_code = 200
-    appeared_response.headers = {"Link": None}
-    appeared_response.raise_for_status.return_value = None
-    appeared_response.json.return_value = {
-        "workflow_runs": [
-            {
-                "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
-                "name": "build",
-                "status": "in_progress",
-                "conclusion": None,
-            },
-        ]
-    }
+    appeared_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+                    "name": "build",
+                    "status": "in_progress",
+                    "conclusion": None,
+                },
+            ]
+        },
+        headers={"Link": None},
+    )
 
     # Polling that specific run shows it completed successfully.
-    completed_response = MagicMock()
-    completed_response.status_code = 200
-    completed_response.raise_for_status.return_value = None
-    completed_response.json.return_value = {
-        "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
-        "name": "build",
-        "status": "completed",
-        "conclusion": "success",
-    }
-
-    mock_get.side_effect = [empty_response, appeared_response, completed_response]
+    completed_response = FakeResponse(
+        json_data={
+            "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+            "name": "build",
+            "status": "completed",
+            "conclusion": "success",
+        },
+    )
+
+    mock_get.side_effect = [
+        empty_response,
+        appeared_response,
+        completed_response,
+    ]
 
     result = get_last_successful_workflow_for_commit("abc123", workflow_name="build")
 
     assert result is not None
     assert result["id"] == LATEST_IN_PROGRESS_WORKFLOW_ID
+    # A single page of runs needs no workflow lookup
+    for listing_call in mock_get.call_args_list[:2]:
+        assert "/actions/runs?" in listing_call[0][0]
     # Slept once while waiting for the run to appear.
     mock_sleep.assert_called_once()
 
 
-@patch.dict(
-    os.environ,
-    {"GITHUB_REPOSITORY": "owner/repo", "GITHUB_TOKEN": "test_token"},
-    clear=True,
-)
+@pytest.mark.usefixtures("github_env")
+def test_lists_older_runs_per_workflow_when_first_page_has_none(mock_get, caplog):
+    # The first page of the repository wide listing only holds other workflows
+    repository_page_response = FakeResponse(
+        json_data={
+            "total_count": 250,
+            "workflow_runs": [
+                {"id": 400 - i, "name": "lint", "status": "completed"}
+                for i in range(100)
+            ],
+        },
+    )
+    workflows_response = FakeResponse(
+        json_data={
+            "workflows": [
+                {"id": BUILD_WORKFLOW_ID, "name": "build", "path": ".github/build.yml"}
+            ]
+        },
+    )
+    workflow_page_response = FakeResponse(
+        json_data={
+            "total_count": 1,
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "name": "build",
+                    "status": "completed",
+                    "conclusion": "success",
+                }
+            ],
+        },
+    )
+    mock_get.side_effect = [
+        repository_page_response,
+        workflows_response,
+        workflow_page_response,
+    ]
+
+    caplog.set_level(logging.INFO)
+
+    result = get_last_successful_workflow_for_commit("abc123", workflow_name="build")
+
+    assert result is not None
+    assert result["id"] == SUCCESSFUL_WORKFLOW_ID
+    requested_urls = [call[0][0] for call in mock_get.call_args_list]
+    assert "/actions/runs?" in requested_urls[0]
+    assert "/actions/workflows?" in requested_urls[1]
+    assert f"/actions/workflows/{BUILD_WORKFLOW_ID}/runs?" in requested_urls[2]
+    # The workflows lookup is not a page of runs, only both first pages count
+    assert "after requesting 2 page(s)" in caplog.text
+
+
+@pytest.mark.usefixtures("github_env")
 @patch("github_semver.commit_version.MAX_WAIT_TIME", 0)
-@patch("github_semver.commit_version.requests.get")
 @patch("github_semver.commit_version.time.sleep")
 def test_returns_none_when_no_run_appears_before_timeout(mock_sleep, mock_get):
     # No run is ever listed for the commit; the wait must be bounded.
-    empty_response = MagicMock()
-    empty_response.status_code = 200
-    empty_response.headers = {"Link": None}
-    empty_response.raise_for_status.return_value = None
-    empty_response.json.return_value = {"workflow_runs": []}
+    empty_response = FakeResponse(
+        json_data={"workflow_runs": []},
+        headers={"Link": None},
+    )
     mock_get.return_value = empty_response
 
     result = get_last_successful_workflow_for_commit("abc123", workflow_name="build")
 
     assert result is None
     mock_sleep.assert_not_called()
+
+
+@pytest.mark.usefixtures("github_env")
+def test_304_uses_cached_body(mock_get, tmp_path):
+    # The first listing is cached with its ETag, the second is revalidated
+    listed_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                }
+            ]
+        },
+        headers={"Link": None, "ETag": '"etag-1"'},
+    )
+
+    not_modified_response = FakeResponse(status_code=304)
+
+    mock_get.side_effect = [listed_response, not_modified_response]
+
+    with patch.dict(os.environ, {"RUNNER_TEMP": str(tmp_path)}):
+        first = get_last_successful_workflow_for_commit("abc123")
+        second = get_last_successful_workflow_for_commit("abc123")
+
+    assert first == second
+    assert second["id"] == SUCCESSFUL_WORKFLOW_ID
+    second_call_headers = mock_get.call_args_list[1][1]["headers"]
+    assert second_call_headers["If-None-Match"] == '"etag-1"'
+
+
+@patch.dict(_rate_limit, {"remaining": None, "reset": None})
+@patch("github_semver.commit_version.time.sleep")
+@patch("github_semver.commit_version.time.time", return_value=1_000)
+def test_waits_for_rate_limit_reset_before_next_request(
+    mock_time,  # noqa: ARG001
+    mock_sleep,
+    mock_get,
+):
+    # The first response uses up the rate limit, which resets 30 seconds later
+    exhausted_response = FakeResponse(
+        headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "1030",
+        },
+    )
+    mock_get.return_value = exhausted_response
+
+    _make_request_with_retry("https://api.github.com/first", {})
+    mock_sleep.assert_not_called()
+
+    _make_request_with_retry("https://api.github.com/second", {})
+    # Slept until the reset (plus buffer) instead of requesting a 429 response
+    mock_sleep.assert_called_once_with(31)
+
+
+@pytest.mark.usefixtures("github_env")
+def test_main_reuses_version_found_earlier_in_job(mock_get, tmp_path, capsys):
+    runs_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                }
+            ]
+        },
+    )
+
+    metadata_response = FakeResponse(
+        json_data={"artifacts": [{"id": EXPECTED_ARTIFACT_ID, "name": "version"}]},
+    )
+
+    download_response = make_download_response(VERSION_ZIP)
+
+    mock_get.side_effect = [runs_response, metadata_response, download_response]
+
+    with patch.dict(os.environ, {"RUNNER_TEMP": str(tmp_path)}):
+        assert main("abc123", "version") == 0
+        assert main("abc123", "version") == 0
+
+    # The second invocation is answered from the cache without any API call
+    assert mock_get.call_count == 3  # noqa: PLR2004
+    assert capsys.readouterr().out == "1.2.3\n1.2.3\n"
+
+
+@pytest.mark.usefixtures("github_env")
+@patch("github_semver.commit_version.time.sleep")
+def test_main_does_not_reuse_version_of_run_still_in_progress(
+    mock_sleep,  # noqa: ARG001
+    mock_get,
+    tmp_path,
+    monkeypatch,
+    capsys,
+):
+    in_progress_run = {
+        "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+        "status": "in_progress",
+        "conclusion": None,
+    }
+    runs_response = FakeResponse(json_data={"workflow_runs": [in_progress_run]})
+    metadata_response = FakeResponse(
+        json_data={"artifacts": [{"id": EXPECTED_ARTIFACT_ID, "name": "version"}]},
+    )
+    # The run fails after its version artifact was uploaded
+    failed_response = FakeResponse(
+        json_data={**in_progress_run, "status": "completed", "conclusion": "failure"},
+    )
+    mock_get.side_effect = [
+        runs_response,
+        metadata_response,
+        make_download_response(VERSION_ZIP),
+        runs_response,
+        failed_response,
+    ]
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+
+    monkeypatch.setenv("DO_NOT_WAIT_FOR_SUCCESS", "true")
+    assert main("abc123", "version") == 0
+    monkeypatch.delenv("DO_NOT_WAIT_FOR_SUCCESS")
+    assert main("abc123", "version") == 1
+
+    # The caller waiting for success looked the run up instead of using the cache
+    assert mock_get.call_count == 5  # noqa: PLR2004
+    assert capsys.readouterr().out == "1.2.3\n"
+
+
+@pytest.mark.usefixtures("github_env")
+def test_main_fails_fast_when_github_is_unreachable(mock_get, caplog):
+    mock_get.side_effect = requests.exceptions.ConnectionError("connection refused")
+
+    assert main("abc123", "version") == 1
+    assert mock_get.call_count == 1
+    assert "Could not reach the GitHub API" in caplog.text
+
+
+@pytest.mark.usefixtures("github_env")
+def test_main_logs_permissions_hint_when_forbidden(mock_get, caplog):
+    # A real response, which is falsy for any 4xx/5xx status
+    forbidden_response = requests.Response()
+    forbidden_response.status_code = 403
+    forbidden_response.reason = "Forbidden"
+    forbidden_response.url = "https://api.github.com/repos/owner/repo/actions/runs"
+    mock_get.return_value = forbidden_response
+
+    assert main("abc123", "version") == 1
+    assert "403 Forbidden when downloading artifact 'version'" in caplog.text
+    assert "actions:read" in caplog.text
+
+
+@pytest.mark.usefixtures("github_env")
+@patch("github_semver.commit_version.time.sleep")
+def test_polling_revalidates_unchanged_run(mock_sleep, mock_get):  # noqa: ARG001
+    listing_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+                    "status": "in_progress",
+                    "conclusion": None,
+                }
+            ]
+        },
+    )
+
+    in_progress_response = FakeResponse(
+        json_data={
+            "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+            "status": "in_progress",
+            "conclusion": None,
+        },
+        headers={"ETag": '"run-1"'},
+    )
+
+    # The run did not change between the first and second poll
+    not_modified_response = FakeResponse(status_code=304)
+
+    completed_response = FakeResponse(
+        json_data={
+            "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+            "status": "completed",
+            "conclusion": "success",
+        },
+        headers={"ETag": '"run-2"'},
+    )
+
+    mock_get.side_effect = [
+        listing_response,
+        in_progress_response,
+        not_modified_response,
+        completed_response,
+    ]
+
+    result = get_last_successful_workflow_for_commit("abc123")
+
+    assert result is not None
+    assert result["conclusion"] == "success"
+    for poll_call in mock_get.call_args_list[2:]:
+        assert poll_call[1]["headers"]["If-None-Match"] == '"run-1"'
+
+
+@pytest.mark.usefixtures("github_env")
+@patch("github_semver.commit_version.random.uniform", return_value=0)
+@patch("github_semver.commit_version.time.sleep")
+def test_polling_backs_off_until_status_changes(
+    mock_sleep,
+    mock_uniform,  # noqa: ARG001
+    mock_get,
+):
+    def run_response(status, conclusion=None):
+        return FakeResponse(
+            json_data={
+                "id": LATEST_IN_PROGRESS_WORKFLOW_ID,
+                "status": status,
+                "conclusion": conclusion,
+            },
+        )
+
+    mock_get.side_effect = [
+        run_response("queued"),
+        run_response("queued"),
+        run_response("in_progress"),
+        run_response("in_progress"),
+        run_response("completed", "success"),
+    ]
+
+    result = _wait_for_workflow_completion(
+        {"id": LATEST_IN_PROGRESS_WORKFLOW_ID, "status": "queued"}
+    )
+
+    assert result is not None
+    # The interval doubles while nothing changes and resets once the run starts
+    assert [c[0][0] for c in mock_sleep.call_args_list] == [10, 20, 10, 20]
+
+
+def test_session_retries_transient_server_errors():
+    adapter = get_session().get_adapter("https://api.github.com/repos/owner/repo")
+
+    retry = adapter.max_retries
+
+    assert retry.is_retry("GET", 503, has_retry_after=False)
+    # Rate limited responses are left to _make_request_with_retry
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert not retry.is_retry("GET", 403, has_retry_after=True)
+    # Timeouts are not retried, an unresponsive API fails on the first one
+    with pytest.raises(MaxRetryError):
+        retry.increment("GET", "/repos/owner/repo", error=ConnectTimeoutError())
+    with pytest.raises(MaxRetryError):
+        retry.increment(
+            "GET", "/repos/owner/repo", error=ReadTimeoutError(None, "/", "")
+        )
+
+
+@pytest.mark.usefixtures("github_env")
+@patch("github_semver.commit_version.random.uniform", return_value=0)
+@patch("github_semver.commit_version.time.sleep")
+def test_backs_off_while_waiting_for_workflow_run_to_appear(
+    mock_sleep,
+    mock_uniform,  # noqa: ARG001
+    mock_get,
+):
+    empty_response = FakeResponse(json_data={"workflow_runs": []})
+    appeared_response = FakeResponse(
+        json_data={
+            "workflow_runs": [
+                {
+                    "id": SUCCESSFUL_WORKFLOW_ID,
+                    "status": "completed",
+                    "conclusion": "success",
+                }
+            ]
+        },
+    )
+    mock_get.side_effect = [
+        empty_response,
+        empty_response,
+        empty_response,
+        empty_response,
+        appeared_response,
+    ]
+
+    result = get_last_successful_workflow_for_commit("abc123")
+
+    assert result["id"] == SUCCESSFUL_WORKFLOW_ID
+    # The interval doubles up to the cap while no run is listed
+    assert [c[0][0] for c in mock_sleep.call_args_list] == [10, 20, 40, 60]
+
+
+@pytest.mark.usefixtures("github_env")
+@patch("github_semver.commit_version.time.sleep")
+@patch("github_semver.commit_version.time.time")
+def test_never_sleeps_a_negative_time_when_deadline_passes_mid_poll(
+    mock_time, mock_sleep, mock_get
+):
+    mock_get.return_value = FakeResponse(json_data={"workflow_runs": []})
+    # The deadline passes between its check and computing the time left to sleep
+    mock_time.side_effect = [
+        0,
+        MAX_WAIT_TIME - 0.5,
+        MAX_WAIT_TIME + 0.5,
+        MAX_WAIT_TIME + 1,
+    ]
+
+    assert get_last_successful_workflow_for_commit("abc123") is None
+    mock_sleep.assert_called_once_with(0)
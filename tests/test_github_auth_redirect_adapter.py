@@ -1,33 +1,40 @@
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from github_semver.github_auth_redirect_adapter import GitHubAuthRedirectAdapter
 
+# Test constants
+ORIGINAL_URL = "https://api.github.com/repos/owner/repo/actions/artifacts/123/zip"
+AUTH_HEADERS = {
+    "Authorization": "Bearer test_token",
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+
+
+@pytest.fixture(scope="class")
+def adapter():
+    # send() only mutates the request it is given, so one adapter can serve a class
+    return GitHubAuthRedirectAdapter(ORIGINAL_URL, AUTH_HEADERS)
+
 
 class TestGitHubAuthRedirectAdapter:
     """Test cases for GitHubAuthRedirectAdapter."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.original_url = (
-            "https://api.github.com/repos/owner/repo/actions/artifacts/123/zip"
-        )
-        self.auth_headers = {
-            "Authorization": "Bearer test_token",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
-        self.adapter = GitHubAuthRedirectAdapter(self.original_url, self.auth_headers)
-
-    def test_adapter_initialization(self):
+    def test_adapter_initialization(self, adapter):
         """Test that adapter initializes correctly."""
-        assert self.adapter.original_url == self.original_url
-        assert self.adapter.auth_headers == self.auth_headers
+        assert adapter.original_url == ORIGINAL_URL
+        assert adapter.auth_headers == AUTH_HEADERS
 
-    @patch("github_semver.github_auth_redirect_adapter._should_include_auth_header")
-    def test_send_includes_auth_headers_same_host(self, mock_should_include):
-        """Test that auth headers are included when redirecting to same host."""
-        mock_should_include.return_value = True
+    def test_adapter_passes_pool_settings_to_http_adapter(self):
+        """Test that connection pool settings reach the underlying HTTPAdapter."""
+        adapter = GitHubAuthRedirectAdapter(ORIGINAL_URL, AUTH_HEADERS, pool_maxsize=4)
+
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 4  # noqa: PLR2004
 
+    def test_send_includes_auth_headers_same_host(self, adapter):
+        """Test that auth headers are included when redirecting to same host."""
         # Create a mock request
         request = MagicMock()
         request.url = "https://api.github.com/redirected/path"
@@ -38,7 +45,7 @@ class TestGitHubAuthRedirectAdapter:
             mock_response = MagicMock()
             mock_parent_send.return_value = mock_response
 
-            result = self.adapter.send(request)
+            result = adapter.send(request)
 
             # Verify auth headers were added
             assert "Authorization" in request.headers
@@ -53,4 +60,16 @@ class TestGitHubAuthRedirectAdapter:
             mock_parent_send.assert_called_once_with(request)
             assert result == mock_response
 
+    def test_send_removes_auth_header_cross_host(self, adapter):
+        """Test that the auth header is removed when redirecting to another host."""
+        request = MagicMock()
+        request.url = "https://pipelines.actions.githubusercontent.com/artifact.zip"
+        request.headers = {"Authorization": "Bearer test_token"}
+
+        with patch("requests.adapters.HTTPAdapter.send"):
+            adapter.send(request)
+
+        assert "Authorization" not in request.headers
+        assert request.headers["User-Agent"] == "actions-semver/1.0"
+
     # ...existing code...
@@ -1,11 +1,16 @@
 import os
 import subprocess
+from types import MappingProxyType
 from unittest import mock
 
 import pytest
 
 from github_semver.run_semver import main
 
+# Test constants
+SHA = "ab" * 20  # Full 40-char SHA
+BASE_ENV = MappingProxyType({"GITHUB_SHA": SHA, "REPO_DEFAULT_BRANCH": "main"})
+
 
 @mock.patch.dict(os.environ, clear=True)
 def test_when_no_environment_variables_then_throw_error():
@@ -14,169 +19,113 @@ def test_when_no_environment_variables_then_throw_error():
     assert "environment" in str(cm.value)
 
 
-@mock.patch.dict(
-    os.environ,
-    {
-        "GITHUB_SHA": "abababababababababababababababababababab",  # Full 40-char SHA
-        "GITHUB_REF": "refs/heads/feature/abc-def",
-        "GITHUB_REF_NAME": "feature/abc-def",
-        "REPO_DEFAULT_BRANCH": "main",
-        "GITHUB_RUN_NUMBER": "1",
-    },
-    clear=True,
+# git ls-remote output listing the 1.0.0 and 0.0.1 tags
+TAGS_OUTPUT = (
+    "b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/1.0.0\n"
+    "fcc84d34053e580507cb79583587b37812a21e10\trefs/tags/0.0.1\n"
+)
+V_PREFIXED_TAGS_OUTPUT = (
+    "b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/v1.0.0\n"
+    "fcc84d34053e580507cb79583587b37812a21e10\trefs/tags/v0.0.1\n"
 )
-@mock.patch.object(subprocess, "check_output")
-def test_when_environment_variables_are_set_build_version_is_bumped(
-    mock_check_output, capsys
-):
-    mock_check_output.return_value = b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/1.0.0\nfcc84d34053e580507cb79583587b37812a21e10\trefs/tags/0.0.1\n"
-
-    main()
-
-    assert capsys.readouterr().out == "0.0.1-build.1+featureabcdef.abababa\n"
-
 
-@mock.patch.dict(
-    os.environ,
+# Read-only so one parametrized case cannot leak changes into another
+FEATURE_BRANCH_ENV = MappingProxyType(
     {
-        "GITHUB_SHA": "abababababababababababababababababababab",
+        **BASE_ENV,
         "GITHUB_REF": "refs/heads/feature/abc-def",
         "GITHUB_REF_NAME": "feature/abc-def",
-        "REPO_DEFAULT_BRANCH": "main",
         "GITHUB_RUN_NUMBER": "1",
-    },
-    clear=True,
+    }
 )
-@mock.patch.object(subprocess, "check_output")
-def test_when_no_tag_is_found_default_to_first_patch(mock_check_output, capsys):
-    mock_check_output.return_value = (
-        b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/my-new-tag\n"
-    )
-
-    main()
-
-    assert capsys.readouterr().out == "0.0.1-build.1+featureabcdef.abababa\n"
-
-
-@mock.patch.dict(
-    os.environ,
+DEFAULT_BRANCH_ENV = MappingProxyType(
     {
-        "GITHUB_SHA": "abababababababababababababababababababab",
+        **BASE_ENV,
         "GITHUB_REF": "refs/heads/main",
         "GITHUB_REF_NAME": "main",
-        "REPO_DEFAULT_BRANCH": "main",
         "GITHUB_RUN_NUMBER": "1",
-    },
-    clear=True,
+    }
 )
-@mock.patch.object(subprocess, "check_output")
-def test_when_run_on_default_branch_patch_bump_based_on_last_tag(
-    mock_check_output, capsys
-):
-    mock_check_output.return_value = b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/1.0.0\nfcc84d34053e580507cb79583587b37812a21e10\trefs/tags/0.0.1\n"
-
-    main()
-    assert capsys.readouterr().out == "1.0.1-rc.1+abababa\n"
-
-
-@mock.patch.dict(
-    os.environ,
+PULL_REQUEST_ENV = MappingProxyType(
     {
-        "GITHUB_SHA": "abababababababababababababababababababab",
-        "GITHUB_REF": "refs/heads/main",
-        "GITHUB_REF_NAME": "main",
-        "REPO_DEFAULT_BRANCH": "main",
-        "GITHUB_RUN_NUMBER": "1",
-    },
-    clear=True,
-)
-@mock.patch.object(subprocess, "check_output")
-def test_when_tag_has_v_prefix_it_is_recognized_and_bumped(mock_check_output, capsys):
-    mock_check_output.return_value = b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/v1.0.0\nfcc84d34053e580507cb79583587b37812a21e10\trefs/tags/v0.0.1\n"
-
-    main()
-    assert capsys.readouterr().out == "1.0.1-rc.1+abababa\n"
-
-
-@mock.patch.dict(
-    os.environ,
-    {
-        "GITHUB_SHA": "abababababababababababababababababababab",
-        "GITHUB_REF": "refs/heads/main",
-        "GITHUB_REF_NAME": "main",
-        "REPO_DEFAULT_BRANCH": "main",
-        "GITHUB_RUN_NUMBER": "1",
-    },
-    clear=True,
-)
-@mock.patch.object(subprocess, "check_output")
-def test_when_run_on_default_branch_without_tag_bump_to_0_0_2_rc(
-    mock_check_output, capsys
-):
-    mock_check_output.return_value = b""
-    main()
-    assert capsys.readouterr().out == "0.0.2-rc.1+abababa\n"
-
-
-@mock.patch.dict(
-    os.environ,
-    {
-        "GITHUB_SHA": "abababababababababababababababababababab",
+        **BASE_ENV,
         "GITHUB_REF": "refs/pull/123/merge",
         "GITHUB_HEAD_REF": "feature/my-feature",
-        "REPO_DEFAULT_BRANCH": "main",
         "GITHUB_RUN_NUMBER": "42",
-    },
-    clear=True,
+    }
 )
-@mock.patch.object(subprocess, "check_output")
-def test_when_run_on_pull_request_patch_bump_build_version(mock_check_output, capsys):
-    mock_check_output.return_value = b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/1.0.0\nfcc84d34053e580507cb79583587b37812a21e10\trefs/tags/0.0.1\n"
-
-    main()
-
-    assert capsys.readouterr().out == "0.0.1-build.42+featuremyfeature.abababa\n"
 
 
-@mock.patch.dict(
-    os.environ,
-    {
-        "GITHUB_SHA": "abababababababababababababababababababab",
-        "GITHUB_REF": "refs/pull/123/merge",
-        "GITHUB_HEAD_REF": "feature/my-feature",
-        "REPO_DEFAULT_BRANCH": "main",
-        "GITHUB_RUN_NUMBER": "42",
-    },
-    clear=True,
+@pytest.mark.parametrize(
+    ("env", "tags_output", "expected"),
+    [
+        pytest.param(
+            FEATURE_BRANCH_ENV,
+            TAGS_OUTPUT,
+            "0.0.1-build.1+featureabcdef.abababa\n",
+            id="feature-branch-bumps-build-version",
+        ),
+        pytest.param(
+            FEATURE_BRANCH_ENV,
+            "b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/my-new-tag\n",
+            "0.0.1-build.1+featureabcdef.abababa\n",
+            id="no-semver-tag-defaults-to-first-patch",
+        ),
+        pytest.param(
+            DEFAULT_BRANCH_ENV,
+            TAGS_OUTPUT,
+            "1.0.1-rc.1+abababa\n",
+            id="default-branch-patch-bumps-last-tag",
+        ),
+        pytest.param(
+            DEFAULT_BRANCH_ENV,
+            V_PREFIXED_TAGS_OUTPUT,
+            "1.0.1-rc.1+abababa\n",
+            id="default-branch-recognizes-v-prefix",
+        ),
+        pytest.param(
+            DEFAULT_BRANCH_ENV,
+            "",
+            "0.0.2-rc.1+abababa\n",
+            id="default-branch-without-tag-bumps-to-0.0.2-rc",
+        ),
+        pytest.param(
+            PULL_REQUEST_ENV,
+            TAGS_OUTPUT,
+            "0.0.1-build.42+featuremyfeature.abababa\n",
+            id="pull-request-bumps-build-version",
+        ),
+        pytest.param(
+            PULL_REQUEST_ENV,
+            "",
+            "0.0.1-build.42+featuremyfeature.abababa\n",
+            id="pull-request-without-tag-bumps-to-first-patch",
+        ),
+        pytest.param(
+            {**DEFAULT_BRANCH_ENV, "BUILD_RC_SEMVER": "False"},  # Disable RC building
+            TAGS_OUTPUT,
+            "1.0.1\n",
+            id="default-branch-with-rc-disabled-has-no-rc-suffix",
+        ),
+    ],
 )
 @mock.patch.object(subprocess, "check_output")
-def test_when_run_on_pull_request_without_tag_bump_to_first_patch(
-    mock_check_output, capsys
+def test_version_is_generated_from_environment_and_tags(
+    mock_check_output, env, tags_output, expected, capsys
 ):
-    mock_check_output.return_value = b""
+    mock_check_output.return_value = tags_output
 
-    main()
+    with mock.patch.dict(os.environ, env, clear=True):
+        main()
 
-    assert capsys.readouterr().out == "0.0.1-build.42+featuremyfeature.abababa\n"
+    assert capsys.readouterr().out == expected
 
 
-@mock.patch.dict(
-    os.environ,
-    {
-        "GITHUB_SHA": "abababababababababababababababababababab",
-        "GITHUB_REF": "refs/heads/main",
-        "GITHUB_REF_NAME": "main",
-        "REPO_DEFAULT_BRANCH": "main",
-        "GITHUB_RUN_NUMBER": "1",
-        "BUILD_RC_SEMVER": "False",  # Disable RC building
-    },
-    clear=True,
-)
-@mock.patch.object(subprocess, "check_output")
-def test_when_run_on_default_branch_with_rc_disabled_no_rc_suffix(
-    mock_check_output, capsys
-):
-    mock_check_output.return_value = b"b2984df042ba025c1f46f74eaea18945fc504e7a\trefs/tags/1.0.0\nfcc84d34053e580507cb79583587b37812a21e10\trefs/tags/0.0.1\n"
-
+@mock.patch.dict(os.environ, DEFAULT_BRANCH_ENV, clear=True)
+@mock.patch.object(subprocess, "check_output", return_value="")
+def test_git_only_lists_tags_that_can_hold_a_version(mock_check_output):
     main()
-    assert capsys.readouterr().out == "1.0.1\n"
+
+    # non-semver tags are filtered out by git before they are listed
+    git_args = mock_check_output.call_args[0][0]
+    assert git_args[-2:] == ["refs/tags/[0-9]*", "refs/tags/v[0-9]*"]